@@ -1,128 +1,501 @@
 import json
 import os
+import re
+import sys
 import argparse
-from collections import defaultdict
+import pickle
+import hashlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-def analyze_json_structure(data, path="", result=None, level=0):
+# 可选加速依赖：ijson 提供C级别的事件流解析，优先使用yajl2_c后端
+try:
+    from ijson.backends import yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+# 可选加速依赖：orjson 的Rust解析器比标准库json快2~6倍，
+# 产出完全相同的dict/list树，其JSONDecodeError兼容json.JSONDecodeError
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 可选加速依赖：numpy 用于一致性分析中的类型计数透视表
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 预先映射JSON值类型到类型名，一次C级字典查找替代两次属性访问，
+# 并让所有字段记录共享同一批字符串对象
+_TYPE_NAME = {
+    dict: "dict",
+    list: "list",
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    type(None): "NoneType"
+}
+
+# 跨文件的子树结构缓存（每个工作进程各自持有一份）：
+# 规范序列化 -> 首次出现的子字典实例
+_canon_subtrees = {}
+# 出现超过一次的共享子字典的id集合
+_shared_subtree_ids = set()
+
+def _canonical_dumps(obj):
+    """按键排序序列化JSON对象，作为子树结构的规范指纹"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # 超出64位范围的整数orjson无法序列化，退回标准库
+            pass
+    return json.dumps(obj, sort_keys=True)
+
+def _dedupe_shared_subtrees(data):
     """
-    递归分析JSON结构，记录每个字段的路径、类型和层级
-    
+    将重复出现的子字典替换为同一共享实例
+
+    以规范序列化（键排序）识别结构相同的子字典；识别范围与
+    analyze_json_structure的遍历一致（列表只看首元素）。缓存跨文件保留，
+    批量分析中反复出现的schema块后续可按id命中分析缓存，只需分析一次
+
+    参数:
+    - data: 已解析的JSON数据，就地替换重复子字典
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            for key, value in node.items():
+                if type(value) is dict:
+                    canon = _canonical_dumps(value)
+                    first = _canon_subtrees.get(canon)
+                    if first is None:
+                        _canon_subtrees[canon] = value
+                        stack.append(value)
+                    else:
+                        node[key] = first
+                        _shared_subtree_ids.add(id(first))
+                elif type(value) is list:
+                    stack.append(value)
+        elif type(node) is list and node:
+            item = node[0]
+            if type(item) is dict:
+                canon = _canonical_dumps(item)
+                first = _canon_subtrees.get(canon)
+                if first is None:
+                    _canon_subtrees[canon] = item
+                    stack.append(item)
+                else:
+                    node[0] = first
+                    _shared_subtree_ids.add(id(first))
+            elif type(item) is list:
+                stack.append(item)
+
+def analyze_json_structure(data, path="", result=None, level=0, memo=None):
+    """
+    迭代分析JSON结构，记录每个字段的路径、类型和层级
+
+    使用显式栈代替递归，每个节点不再付出Python函数调用的开销，
+    同时不受解释器递归深度限制
+
     参数:
     - data: 要分析的JSON数据
     - path: 当前字段的路径
     - result: 存储分析结果的字典
     - level: 当前层级深度
-    
+    - memo: 共享子字典的分析结果缓存 {id(子字典): 相对分析结果}，
+      配合_dedupe_shared_subtrees使用，命中时直接重定位缓存结果
+
     返回:
     - 包含分析结果的字典
     """
     if result is None:
         result = {
-            "fields": [],
-            "types": defaultdict(int),
+            "fields": defaultdict(list),
+            "types": Counter(),
             "max_level": 0
         }
-    
-    # 更新最大层级
-    result["max_level"] = max(result["max_level"], level)
-    
-    if isinstance(data, dict):
-        # 处理字典类型
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            field_info = {
-                "path": current_path,
-                "type": type(value).__name__,
-                "level": level
-            }
-            result["fields"].append(field_info)
-            result["types"][type(value).__name__] += 1
-            
-            # 递归处理嵌套结构
-            if isinstance(value, (dict, list)):
-                analyze_json_structure(value, current_path, result, level + 1)
-    
-    elif isinstance(data, list):
-        # 处理列表类型
-        result["types"]["list"] += 1
-        
-        # 分析列表中的第一个元素作为示例（如果存在）
-        if data:
-            sample_item = data[0]
-            sample_path = f"{path}[0]"
-            field_info = {
-                "path": sample_path,
-                "type": type(sample_item).__name__,
-                "level": level
-            }
-            result["fields"].append(field_info)
-            
-            # 递归处理嵌套结构
-            if isinstance(sample_item, (dict, list)):
-                analyze_json_structure(sample_item, sample_path, result, level + 1)
-    
+
+    # 提升为局部变量，避免循环内重复的属性/下标查找
+    fields = result["fields"]
+    types = result["types"]
+    max_level = result["max_level"]
+    # 类型先收集到平铺列表，结束时由Counter在C层一次性计数
+    type_names = []
+    type_names_append = type_names.append
+
+    def replay_cached(sub_dict, prefix, base_level):
+        """将共享子字典的缓存分析结果重定位到当前路径和层级"""
+        cached = memo.get(id(sub_dict))
+        if cached is None:
+            cached = analyze_json_structure(sub_dict, memo=memo)
+            memo[id(sub_dict)] = cached
+        for sub_level, bucket in cached["fields"].items():
+            fields[base_level + sub_level].extend(
+                [(f"{prefix}.{sub_path}", sub_type) for sub_path, sub_type in bucket])
+        for type_name, count in cached["types"].items():
+            types[type_name] += count
+        return base_level + cached["max_level"]
+
+    # 栈上只保存路径段元组（复制D个指针），完整路径字符串在出栈时
+    # 对每个容器拼接一次，不随嵌套加深反复重建
+    stack = [(data, (path,) if path else (), level)]
+    while stack:
+        data, path_parts, level = stack.pop()
+
+        # 更新最大层级
+        if level > max_level:
+            max_level = level
+
+        if type(data) is dict:
+            # 处理字典类型
+            path = ".".join(path_parts)
+            for key, value in data.items():
+                current_path = f"{path}.{key}" if path else key
+                value_type = type(value)
+                type_name = _TYPE_NAME.get(value_type) or value_type.__name__
+                fields[level].append((current_path, type_name))
+                type_names_append(type_name)
+
+                # 嵌套结构入栈，稍后处理；共享子字典直接重放缓存结果
+                if value_type is dict or value_type is list:
+                    if memo is not None and id(value) in _shared_subtree_ids:
+                        reached = replay_cached(value, current_path, level + 1)
+                        if reached > max_level:
+                            max_level = reached
+                    else:
+                        stack.append((value, path_parts + (key,), level + 1))
+
+        elif type(data) is list:
+            # 处理列表类型
+            type_names_append("list")
+
+            # 分析列表中的第一个元素作为示例（如果存在）
+            if data:
+                sample_item = data[0]
+                # 数组下标并入最后一个路径段，不新增层级
+                if path_parts:
+                    sample_parts = path_parts[:-1] + (f"{path_parts[-1]}[0]",)
+                else:
+                    sample_parts = ("[0]",)
+                sample_path = ".".join(sample_parts)
+                sample_type = type(sample_item)
+                fields[level].append(
+                    (sample_path, _TYPE_NAME.get(sample_type) or sample_type.__name__))
+
+                # 嵌套结构入栈，稍后处理；共享子字典直接重放缓存结果
+                if sample_type is dict or sample_type is list:
+                    if memo is not None and id(sample_item) in _shared_subtree_ids:
+                        reached = replay_cached(sample_item, sample_path, level + 1)
+                        if reached > max_level:
+                            max_level = reached
+                    else:
+                        stack.append((sample_item, sample_parts, level + 1))
+
+    types.update(type_names)
+    result["max_level"] = max_level
     return result
 
+def analyze_json_events(f, buf_size=65536):
+    """
+    基于ijson事件流分析JSON结构，解析在C层完成，逐事件消费，
+    无需在内存中构建完整的对象树，结果与analyze_json_structure一致
+
+    注意两点与默认路径的差异：事件流无法回看，同一对象内的重复键
+    会被逐个记录（默认路径构建dict时后者覆盖前者），因此流式模式
+    假定对象内键唯一；此外ijson对超出64位范围的整数直接报
+    integer overflow解析错误，默认路径则能正常处理
+
+    参数:
+    - f: 已打开的JSON文件对象
+    - buf_size: 每次读取的缓冲区大小（字节）
+
+    返回:
+    - 包含分析结果的字典
+    """
+    result = {
+        "fields": defaultdict(list),
+        "types": Counter(),
+        "max_level": 0
+    }
+    fields = result["fields"]
+    # 类型先收集到平铺列表，结束时由Counter在C层一次性计数
+    type_names = []
+    type_names_append = type_names.append
+    max_level = 0
+
+    # 容器栈：每项为 [种类, 路径前缀, 字段层级, 已见元素数]
+    stack = []
+    # 当前待绑定的字典键
+    pending_key = None
+    # 跳过深度：大于0时表示处于列表非首个元素的子树中（与递归版只采样首元素一致）
+    skip_depth = 0
+
+    for event, value in ijson.basic_parse(f, buf_size=buf_size, use_float=True):
+        if skip_depth:
+            if event in ("start_map", "start_array"):
+                skip_depth += 1
+            elif event in ("end_map", "end_array"):
+                skip_depth -= 1
+            continue
+
+        if event == "map_key":
+            pending_key = value
+            continue
+
+        if event in ("end_map", "end_array"):
+            stack.pop()
+            continue
+
+        # 确定当前值的路径和层级
+        if stack:
+            kind, prefix, level, count = stack[-1]
+            if kind == "list":
+                if count:
+                    # 非首个列表元素：整棵子树跳过
+                    stack[-1][3] += 1
+                    if event in ("start_map", "start_array"):
+                        skip_depth = 1
+                    continue
+                stack[-1][3] += 1
+                current_path = f"{prefix}[0]"
+                record_type = False
+            else:
+                current_path = f"{prefix}.{pending_key}" if prefix else pending_key
+                record_type = True
+        else:
+            # 顶层值：只有容器需要入栈，非容器无字段可记录
+            kind, current_path, level, record_type = None, "", 0, False
+
+        if event == "start_map":
+            if stack:
+                fields[level].append((current_path, "dict"))
+                if record_type:
+                    type_names_append("dict")
+                level += 1
+                if level > max_level:
+                    max_level = level
+            stack.append(["dict", current_path, level, 0])
+        elif event == "start_array":
+            if stack:
+                fields[level].append((current_path, "list"))
+                if record_type:
+                    type_names_append("list")
+                level += 1
+                if level > max_level:
+                    max_level = level
+            type_names_append("list")
+            stack.append(["list", current_path, level, 0])
+        elif stack:
+            value_type = type(value)
+            type_name = _TYPE_NAME.get(value_type) or value_type.__name__
+            fields[level].append((current_path, type_name))
+            if record_type:
+                type_names_append(type_name)
+
+    result["types"].update(type_names)
+    result["max_level"] = max_level
+    return result
+
+class _SubtreeSummary:
+    """object_pairs_hook自底向上产出的子树分析摘要，代替完整的dict"""
+    __slots__ = ("fields", "types", "max_level")
+
+    def __init__(self, fields, types, max_level):
+        self.fields = fields
+        self.types = types
+        self.max_level = max_level
+
+def _merge_list_sample(fields, types, prefix, lst, base):
+    """
+    将列表的首元素样本并入当前摘要，语义与analyze_json_structure一致
+
+    参数:
+    - fields: 累积的相对字段列表 [(相对层级, 相对路径, 类型名)]
+    - types: 累积的类型计数
+    - prefix: 列表的相对路径前缀
+    - lst: 列表对象（元素为标量、列表或_SubtreeSummary）
+    - base: 进入该列表时的相对层级
+
+    返回:
+    - 该列表子树到达的最大相对层级
+    """
+    types["list"] = types.get("list", 0) + 1
+    reached = base
+    if lst:
+        item = lst[0]
+        item_type = type(item)
+        sample_path = f"{prefix}[0]"
+        if item_type is _SubtreeSummary:
+            fields.append((base, sample_path, "dict"))
+            for sub_level, sub_path, sub_type in item.fields:
+                fields.append((base + 1 + sub_level, f"{sample_path}.{sub_path}", sub_type))
+            for type_name, count in item.types.items():
+                types[type_name] = types.get(type_name, 0) + count
+            if base + 1 + item.max_level > reached:
+                reached = base + 1 + item.max_level
+        elif item_type is list:
+            fields.append((base, sample_path, "list"))
+            sub_reached = _merge_list_sample(fields, types, sample_path, item, base + 1)
+            if sub_reached > reached:
+                reached = sub_reached
+        else:
+            fields.append((base, sample_path,
+                           _TYPE_NAME.get(item_type) or item_type.__name__))
+    return reached
+
+def _summarize_pairs(pairs):
+    """
+    json解码器的object_pairs_hook：把每个JSON对象就地归约为分析摘要
+
+    钩子自底向上触发，子对象在父对象之前归约，因此解析结束时
+    整棵dict树从未完整落地，解析与分析融合为单遍
+    """
+    fields = []
+    types = {}
+    max_level = 0
+    # 重复键按JSON惯例后者覆盖前者，先经dict折叠，与构建完整dict的路径一致
+    for key, value in dict(pairs).items():
+        value_type = type(value)
+        if value_type is _SubtreeSummary:
+            fields.append((0, key, "dict"))
+            types["dict"] = types.get("dict", 0) + 1
+            for sub_level, sub_path, sub_type in value.fields:
+                fields.append((1 + sub_level, f"{key}.{sub_path}", sub_type))
+            for type_name, count in value.types.items():
+                types[type_name] = types.get(type_name, 0) + count
+            if 1 + value.max_level > max_level:
+                max_level = 1 + value.max_level
+        elif value_type is list:
+            fields.append((0, key, "list"))
+            types["list"] = types.get("list", 0) + 1
+            reached = _merge_list_sample(fields, types, key, value, 1)
+            if reached > max_level:
+                max_level = reached
+        else:
+            type_name = _TYPE_NAME.get(value_type) or value_type.__name__
+            fields.append((0, key, type_name))
+            types[type_name] = types.get(type_name, 0) + 1
+    return _SubtreeSummary(fields, types, max_level)
+
+def _analyze_json_fused(buf):
+    """
+    融合解析与分析：单遍扫描得出分析结果，中间dict不落地
+
+    标准库json的无orjson回退路径使用；结果与先加载再遍历完全一致
+
+    参数:
+    - buf: JSON文件内容（bytes或str）
+
+    返回:
+    - 包含分析结果的字典
+    """
+    top = json.loads(buf, object_pairs_hook=_summarize_pairs)
+
+    result = {
+        "fields": defaultdict(list),
+        "types": Counter(),
+        "max_level": 0
+    }
+    fields = result["fields"]
+    types = result["types"]
+
+    top_type = type(top)
+    if top_type is _SubtreeSummary:
+        for level, path, type_name in top.fields:
+            fields[level].append((path, type_name))
+        for type_name, count in top.types.items():
+            types[type_name] += count
+        result["max_level"] = top.max_level
+    elif top_type is list:
+        flat_fields = []
+        flat_types = {}
+        result["max_level"] = _merge_list_sample(flat_fields, flat_types, "", top, 0)
+        for level, path, type_name in flat_fields:
+            fields[level].append((path, type_name))
+        for type_name, count in flat_types.items():
+            types[type_name] += count
+
+    return result
+
+# 报告中的固定段落，预先构建为常量元组，避免每次生成报告时重新创建
+_TYPE_STATS_HEADER = (
+    "",
+    "## 数据类型统计",
+    "",
+    "| 数据类型 | 出现次数 |",
+    "| -------- | -------- |"
+)
+
+_FIELD_LEVEL_HEADER = (
+    "",
+    "## 字段层级结构",
+    "",
+    "| 层级 | 字段路径 | 数据类型 |",
+    "|--|--|--|"
+)
+
+_TREE_HEADER = (
+    "",
+    "## 树形结构可视化",
+    "",
+    "```"
+)
+
 def generate_markdown_report(analysis_result, json_filename):
     """
-    根据分析结果生成Markdown格式的报告
-    
+    根据分析结果逐行生成Markdown格式的报告
+
+    以生成器方式产出，调用方可直接流式写入文件，
+    整份报告无需在内存中拼成一个大字符串
+
     参数:
     - analysis_result: 分析结果字典
     - json_filename: 原始JSON文件名
-    
+
     返回:
-    - Markdown格式的报告文本
+    - 逐行产出报告内容的生成器
     """
     # 提取文件名（不含路径和扩展名）
     base_filename = os.path.basename(json_filename)
     file_title = os.path.splitext(base_filename)[0]
-    
-    # 创建报告标题
-    report = [
-        f"# JSON结构分析报告: {file_title}",
-        "",
-        "## 数据类型统计",
-        "",
-        "| 数据类型 | 出现次数 |",
-        "| -------- | -------- |"
-    ]
-    
-    # 添加类型统计
-    for type_name, count in analysis_result["types"].items():
-        report.append(f"| {type_name} | {count} |")
-    
-    # 添加字段层级结构
-    report.extend([
-        "",
-        "## 字段层级结构",
-        "",
-        "| 层级 | 字段路径 | 数据类型 |",
-        "|--|--|--|"
-    ])
-    
-    # 按层级排序字段
-    sorted_fields = sorted(analysis_result["fields"], key=lambda x: (x["level"], x["path"]))
-    
-    # 添加字段信息
-    for field in sorted_fields:
-        report.append(f"| {field['level']} | {field['path']} | {field['type']} |")
-    
-    # 添加树形结构可视化
-    report.extend([
-        "",
-        "## 树形结构可视化",
-        "",
-        "```",
-    ])
-    
-    # 构建树形结构
-    tree_structure = generate_tree_structure(sorted_fields)
-    report.extend(tree_structure)
-    
-    report.append("```")
-    
-    return "\n".join(report)
+
+    # 报告标题
+    yield f"# JSON结构分析报告: {file_title}"
+
+    # 类型统计（按类型名排序，输出顺序与遍历实现无关，
+    # 默认、--stream和标准库回退路径生成的报告逐字节一致）
+    yield from _TYPE_STATS_HEADER
+    yield from [f"| {type_name} | {count} |"
+                for type_name, count in sorted(analysis_result["types"].items())]
+
+    # 字段层级结构
+    yield from _FIELD_LEVEL_HEADER
+
+    # 字段在遍历时已按层级分桶，只需逐层对小桶排序（桶排序，
+    # 总开销从O(N log N)降为O(N log(N/L))）
+    fields = analysis_result["fields"]
+    sorted_fields = [(level, path, type_name)
+                     for level in sorted(fields)
+                     for path, type_name in sorted(fields[level])]
+
+    # 字段信息（列表推导式一次性构建，替代逐行append）
+    yield from [f"| {field[0]} | {field[1]} | {field[2]} |"
+                for field in sorted_fields]
+
+    # 树形结构可视化
+    yield from _TREE_HEADER
+    yield from generate_tree_structure(sorted_fields)
+    yield "```"
 
 def generate_tree_structure(sorted_fields):
     """
@@ -134,18 +507,20 @@ def generate_tree_structure(sorted_fields):
     返回:
     - 树形结构的文本行列表
     """
-    tree_lines = []
-    
-    for field in sorted_fields:
-        indent = "  " * field["level"]
-        path_parts = field["path"].split(".")
-        current_name = path_parts[-1]
-        tree_lines.append(f"{indent}├── {current_name} ({field['type']})")
-    
-    return tree_lines
+    if not sorted_fields:
+        return []
+
+    # 字段已按层级升序排列，末尾即最大层级；缩进串全部预先生成，
+    # 循环内查表复用而不是每行重新分配
+    max_level = sorted_fields[-1][0]
+    indents = ["  " * i for i in range(max_level + 1)]
+
+    # rpartition避免split产生的中间列表，无"."时第三段即原串
+    return [f"{indents[level]}├── {path.rpartition('.')[2]} ({type_name})"
+            for level, path, type_name in sorted_fields]
+
+def analys_json(input_file, output_dir, stream=False):
 
-def analys_json(input_file, output_dir):
-    
     os.makedirs(output_dir, exist_ok=True)
     
     # 从输入文件名生成输出文件名
@@ -154,22 +529,33 @@ def analys_json(input_file, output_dir):
     output_file = os.path.join(output_dir, f"{file_title}_analysis.md")
     
     # 读取JSON文件
-    with open(input_file, "r", encoding="utf-8") as f:
+    with open(input_file, "rb") as f:
         try:
-            data = json.load(f)
-            print(f"成功加载JSON文件: {input_file}")
-            
-            # 分析JSON结构
-            analysis_result = analyze_json_structure(data)
-            print(f"分析完成，共发现 {len(analysis_result['fields'])} 个字段，最大层级深度: {analysis_result['max_level']}")
-            
-            # 生成Markdown报告
-            markdown_report = generate_markdown_report(analysis_result, input_file)
-            
-            # 保存报告到文件
-            with open(output_file, "w", encoding="utf-8") as out_f:
-                out_f.write(markdown_report)
+            if _use_stream(stream):
+                # 事件流方式：按64KB缓冲区单遍扫描，内存占用与文件大小无关
+                analysis_result = analyze_json_events(f)
+                print(f"成功加载JSON文件: {input_file}")
+            elif orjson is not None:
+                data = _load_json(f)
+                print(f"成功加载JSON文件: {input_file}")
+
+                # 分析JSON结构
+                analysis_result = analyze_json_structure(data)
+            else:
+                # 标准库路径：object_pairs_hook融合解析与分析，
+                # 峰值内存减半（完整的dict树从不落地）
+                analysis_result = _analyze_json_fused(f.read())
+                print(f"成功加载JSON文件: {input_file}")
+            field_count = sum(map(len, analysis_result["fields"].values()))
+            print(f"分析完成，共发现 {field_count} 个字段，最大层级深度: {analysis_result['max_level']}")
             
+            # 逐行流式写出Markdown报告（1MB写缓冲），峰值内存与报告大小无关
+            report_lines = generate_markdown_report(analysis_result, input_file)
+            with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as out_f:
+                # 标题行先写出，其余行以换行符前缀续写，与"\n".join的结果逐字节一致
+                out_f.write(next(report_lines))
+                out_f.writelines(f"\n{line}" for line in report_lines)
+
             print(f"分析报告已保存到: {output_file}")
             
         except json.JSONDecodeError as e:
@@ -177,13 +563,230 @@ def analys_json(input_file, output_dir):
         except Exception as e:
             print(f"处理过程中发生错误: {e}")
 
-def analys_json_folder(input_folder, output_dir):
+def _load_json(f):
+    """
+    读取并解析已打开的JSON文件对象，优先使用orjson
+
+    参数:
+    - f: 以二进制方式打开的JSON文件对象
+
+    返回:
+    - 解析得到的JSON数据
+    """
+    return _loads(f.read())
+
+def _trie_insert(trie, field_path, field_type, file_title):
+    """
+    将一个字段记录插入路径段trie
+
+    相同父路径的字段共享前缀节点，避免为每个叶子重复存储完整路径字符串
+
+    参数:
+    - trie: trie根节点，形如 {"children": {}, "types": {}}
+    - field_path: 完整字段路径（以"."分隔）
+    - field_type: 字段的数据类型名
+    - file_title: 字段所在的文件名
+    """
+    node = trie
+    # 路径段驻留为共享字符串：同名字段跨文件复用同一对象，
+    # 哈希只算一次，trie字典查找走指针相等的快路径
+    for segment in map(sys.intern, field_path.split(".")):
+        children = node["children"]
+        child = children.get(segment)
+        if child is None:
+            child = {"children": {}, "types": {}}
+            children[segment] = child
+        node = child
+
+    files = node["types"].get(field_type)
+    if files is None:
+        node["types"][field_type] = files = []
+    files.append(file_title)
+
+def _iter_trie_fields(trie):
+    """
+    深度优先遍历trie，每层子节点按路径段排序，先序产出每个字段
+
+    产出顺序为子树分组序：父字段的整棵子树先于后续兄弟字段输出。
+    当键包含排序在'.'之前的字符时（如'a'与'a-x'），这与对完整路径
+    做扁平字典序排序不同——后者会把'a-x'插在'a'与'a.b'之间
+
+    参数:
+    - trie: trie根节点
+
+    返回:
+    - 逐个产出 (字段路径, {类型: [文件列表]}) 元组的生成器
+    """
+    # 显式栈DFS，子节点按路径段逆序入栈，出栈即为升序
+    stack = [("", trie)]
+    while stack:
+        prefix, node = stack.pop()
+        if prefix and node["types"]:
+            yield prefix, node["types"]
+
+        children = node["children"]
+        for segment in sorted(children, reverse=True):
+            child_path = f"{prefix}.{segment}" if prefix else segment
+            stack.append((child_path, children[segment]))
+
+def _use_stream(stream):
+    """判断是否启用流式解析，要求ijson可用，不可用时提示并回退"""
+    if stream and ijson is None:
+        print("未安装ijson，无法流式解析，回退到常规加载方式")
+        return False
+    return stream
+
+# 共享子字典的分析结果缓存（每个工作进程各自持有一份）
+_subtree_memo = {}
+
+# 可复用的文件读取缓冲区（每个工作进程各自持有一份），按需增长，
+# 批量处理大量小文件时避免为每个文件分配新的bytes对象
+_read_buf = bytearray(1 << 20)
+
+def _read_file_bytes(json_file):
+    """
+    将整个文件读入可复用缓冲区
+
+    参数:
+    - json_file: 文件路径
+
+    返回:
+    - 文件内容的memoryview（指向共享缓冲区，下次调用前有效）
+    """
+    global _read_buf
+    with open(json_file, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > len(_read_buf):
+            _read_buf = bytearray(size)
+        view = memoryview(_read_buf)
+        pos = 0
+        while pos < size:
+            n = f.readinto(view[pos:size])
+            if not n:
+                break
+            pos += n
+        return view[:pos]
+
+# 19位及以上的数字串可能超出64位整数范围，orjson会把这类整数静默解析
+# 成float（各版本均如此），为保住int类型此类文档退回标准库解析；
+# 字符串里的长数字串只会造成保守的误判，结果仍然正确
+_BIG_INT_RE = re.compile(rb"(?:^|[^.\dEe])\d{19}")
+
+def _loads(buf):
+    """解析缓冲区中的JSON数据，优先使用orjson（可直接消费memoryview）"""
+    if orjson is not None and not _BIG_INT_RE.search(buf):
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            # orjson不接受NaN/Infinity等标准库扩展，重试标准库
+            pass
+    # 标准库json不接受memoryview，此处退化为一次拷贝
+    return json.loads(bytes(buf) if type(buf) is memoryview else buf)
+
+def _analyze_one(json_file, stream=False):
+    """
+    分析单个JSON文件的结构，供进程池工作进程调用
+
+    参数:
+    - json_file: JSON文件路径
+    - stream: 是否使用ijson流式解析（内存占用恒定，适合超大文件）
+
+    返回:
+    - (文件名, 字段列表, 类型统计)元组；文件处理失败时返回None
+    """
+    try:
+        if _use_stream(stream):
+            with open(json_file, "rb") as f:
+                file_result = analyze_json_events(f)
+        else:
+            data = _loads(_read_file_bytes(json_file))
+            # 批量分析时去重共享schema块，重复子树只分析一次
+            _dedupe_shared_subtrees(data)
+            file_result = analyze_json_structure(data, memo=_subtree_memo)
+
+        # 提取文件名（不含路径和扩展名）
+        base_filename = os.path.basename(json_file)
+        file_title = os.path.splitext(base_filename)[0]
+        return file_title, file_result["fields"], dict(file_result["types"])
+
+    except Exception as e:
+        print(f"处理文件 {json_file} 时出错: {e}")
+        return None
+
+def _cache_path(cache_dir, json_file):
+    """返回输入文件对应的缓存分片路径"""
+    digest = hashlib.sha1(os.path.abspath(json_file).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+def _load_cached_result(cache_dir, json_file):
+    """
+    读取输入文件的缓存分析结果
+
+    参数:
+    - cache_dir: 缓存目录
+    - json_file: 输入文件路径
+
+    返回:
+    - 缓存的(文件名, 字段列表, 类型统计)元组；文件已变更或无缓存时返回None
+    """
+    try:
+        stat = os.stat(json_file)
+        with open(_cache_path(cache_dir, json_file), "rb") as f:
+            mtime, size, one_result = pickle.load(f)
+        if mtime == stat.st_mtime and size == stat.st_size:
+            return one_result
+    except (OSError, pickle.PickleError, EOFError, ValueError):
+        pass
+    return None
+
+def _store_cached_result(cache_dir, json_file, one_result):
+    """把输入文件的分析结果连同其mtime和大小写入缓存分片"""
+    try:
+        stat = os.stat(json_file)
+        with open(_cache_path(cache_dir, json_file), "wb") as f:
+            pickle.dump((stat.st_mtime, stat.st_size, one_result), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+def generate_consistency_summary(field_trie, all_files):
+    """
+    只计算字段一致性结论，跳过完整报告的逐字段表格
+
+    参数:
+    - field_trie: 包含所有字段类型信息的trie
+    - all_files: 所有分析的文件名列表
+
+    返回:
+    - {"total_files": 总文件数, "total_fields": 总字段数,
+       "inconsistent_fields": {字段路径: [类型列表]}}
+    """
+    total_fields = 0
+    inconsistent_fields = {}
+    for field_path, types in _iter_trie_fields(field_trie):
+        total_fields += 1
+        if len(types) > 1:
+            inconsistent_fields[field_path] = list(types)
+
+    return {
+        "total_files": len(all_files),
+        "total_fields": total_fields,
+        "inconsistent_fields": inconsistent_fields
+    }
+
+def analys_json_folder(input_folder, output_dir, stream=False, report_level="full"):
     """
     分析指定文件夹中所有JSON文件的结构，判断字段层级关系和字段格式是否一致
-    
+
     参数:
     - input_folder: 输入JSON文件所在的文件夹路径
     - output_dir: 输出分析报告的文件夹路径
+    - stream: 是否使用ijson流式解析（内存占用恒定，适合超大文件）
+    - report_level: "full"生成完整的逐字段报告；"summary"只输出一致性结论，
+      跳过O(字段数×文件数)的表格渲染
+
+    返回:
+    - summary模式下返回一致性摘要字典；full模式下返回None
     """
     import glob
     
@@ -198,74 +801,143 @@ def analys_json_folder(input_folder, output_dir):
     
     print(f"在 {input_folder} 中找到 {len(json_files)} 个JSON文件")
     
-    # 存储所有文件的字段信息
-    # 结构: {字段路径: {类型: [出现的文件列表]}}
-    field_types = {}
+    # 存储所有文件的字段信息，按路径段组织成trie，
+    # 相同父路径的字段共享前缀节点
+    field_trie = {"children": {}, "types": {}}
     
     # 记录所有文件名
     all_files = []
     
-    # 分析每个文件
+    # 按mtime+大小复用上次运行的缓存，重新分析只覆盖有变更的文件
+    cache_dir = os.path.join(output_dir, ".cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    results_by_file = {}
+    pending_files = []
     for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            # 分析JSON结构
-            file_result = analyze_json_structure(data)
-            
-            # 提取文件名（不含路径和扩展名）
-            base_filename = os.path.basename(json_file)
-            file_title = os.path.splitext(base_filename)[0]
-            all_files.append(file_title)
-            
-            # 记录每个字段的类型和出现的文件
-            for field_info in file_result["fields"]:
-                field_path = field_info["path"]
-                field_type = field_info["type"]
-                
-                if field_path not in field_types:
-                    field_types[field_path] = {}
-                
-                if field_type not in field_types[field_path]:
-                    field_types[field_path][field_type] = []
-                
-                field_types[field_path][field_type].append(file_title)
-            
-            print(f"已分析文件: {json_file}")
-            
-        except Exception as e:
-            print(f"处理文件 {json_file} 时出错: {e}")
+        cached = _load_cached_result(cache_dir, json_file)
+        if cached is None:
+            pending_files.append(json_file)
+        else:
+            results_by_file[json_file] = cached
+
+    if results_by_file:
+        print(f"缓存命中 {len(results_by_file)} 个文件，跳过重新解析")
+
+    # 并行分析有变更的文件（文件之间相互独立，进程池绕开GIL实现多核扩展），
+    # 结果按提交顺序返回，合并在主进程中串行完成
+    if pending_files:
+        with ProcessPoolExecutor() as executor:
+            for json_file, one_result in zip(
+                    pending_files,
+                    executor.map(partial(_analyze_one, stream=stream),
+                                 pending_files, chunksize=8)):
+                if one_result is not None:
+                    _store_cached_result(cache_dir, json_file, one_result)
+                results_by_file[json_file] = one_result
+
+    for json_file in json_files:
+        one_result = results_by_file.get(json_file)
+        if one_result is None:
+            continue
+
+        file_title, fields, _types = one_result
+        all_files.append(file_title)
+
+        # 记录每个字段的类型和出现的文件
+        for bucket in fields.values():
+            for field_path, field_type in bucket:
+                _trie_insert(field_trie, field_path, field_type, file_title)
+
+        print(f"已分析文件: {json_file}")
     
+    consistency_file = os.path.join(output_dir, "field_consistency_analysis.md")
+
+    if report_level == "summary":
+        # 快速路径：只输出一致性结论，不渲染逐字段表格
+        summary = generate_consistency_summary(field_trie, all_files)
+        inconsistent_fields = summary["inconsistent_fields"]
+        report = [
+            "# JSON字段一致性分析",
+            "",
+            "## 分析结果概述",
+            "",
+            f"- 总文件数: {summary['total_files']}",
+            f"- 总字段数: {summary['total_fields']}",
+            f"- 格式一致的字段数: {summary['total_fields'] - len(inconsistent_fields)}",
+            f"- 格式不一致的字段数: {len(inconsistent_fields)}"
+        ]
+        if inconsistent_fields:
+            report.extend(("", "## 格式不一致的字段", ""))
+            report.extend([f"- {field_path}: {', '.join(types)}"
+                           for field_path, types in inconsistent_fields.items()])
+
+        with open(consistency_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(report))
+
+        print(f"字段一致性摘要已保存到: {consistency_file}")
+        return summary
+
     # 生成字段一致性分析报告
-    consistency_report = generate_field_consistency_report(field_types, all_files)
-    
+    consistency_report = generate_field_consistency_report(field_trie, all_files)
+
     # 保存字段一致性分析报告
-    consistency_file = os.path.join(output_dir, "field_consistency_analysis.md")
     with open(consistency_file, "w", encoding="utf-8") as f:
         f.write(consistency_report)
-    
+
     print(f"字段一致性分析报告已保存到: {consistency_file}")
 
-def generate_field_consistency_report(field_types, all_files):
+def generate_field_consistency_report(field_trie, all_files):
     """
     生成字段一致性分析报告
-    
+
     参数:
-    - field_types: 包含所有字段类型信息的字典 {字段路径: {类型: [出现的文件列表]}}
+    - field_trie: 包含所有字段类型信息的trie，叶信息形如 {类型: [出现的文件列表]}
     - all_files: 所有分析的文件名列表
-    
+
     返回:
     - Markdown格式的字段一致性分析报告
     """
-    if not field_types:
-        return "# JSON字段一致性分析\n\n未找到有效的字段信息。"
-    
     total_files = len(all_files)
-    
-    # 计算不一致字段数量
-    inconsistent_fields = [path for path, types in field_types.items() if len(types) > 1]
-    
+    # 提到循环外：满员文件列表在字段间完全相同，只格式化一次
+    all_files_str = f"所有{total_files}个文件"
+
+    def format_files(files):
+        """把文件列表缩略为"前两个 等N个文件"的形式"""
+        shown = files[:2] if len(files) > 2 else files
+        return ", ".join(shown) + f" 等{len(files)}个文件"
+
+    # 单遍扫描trie（DFS产出即按路径字典序），同时构建字段表格行
+    # 和不一致字段桶，省去对全部字段的第二次遍历
+    field_rows = []
+    inconsistent_fields = []
+    for field_path, types in _iter_trie_fields(field_trie):
+        is_consistent = len(types) == 1
+
+        # 计算字段层级
+        # 对于根级字段，层级为0；对于每个点号，层级加1
+        # 对于数组元素（如path[0]），不增加层级
+        level = field_path.count(".")
+
+        # 获取类型信息
+        type_info = ", ".join(types.keys())
+
+        # 获取文件信息
+        if is_consistent:
+            # 对于一致的字段，显示文件列表或"所有文件"
+            files = next(iter(types.values()))
+            file_info = all_files_str if len(files) == total_files else format_files(files)
+        else:
+            # 对于不一致的字段，分开显示每种类型对应的文件
+            inconsistent_fields.append((field_path, types))
+            file_info = "<br>".join([f"{type_name}: {format_files(files)}"
+                                     for type_name, files in types.items()])
+
+        field_rows.append(f"| {level} | {field_path} | {type_info} | {'是' if is_consistent else '否'} | {file_info} |")
+
+    if not field_rows:
+        return "# JSON字段一致性分析\n\n未找到有效的字段信息。"
+
     # 生成报告
     report = [
         "# JSON字段一致性分析",
@@ -273,8 +945,8 @@ def generate_field_consistency_report(field_types, all_files):
         f"## 分析结果概述",
         "",
         f"- 总文件数: {total_files}",
-        f"- 总字段数: {len(field_types)}",
-        f"- 格式一致的字段数: {len(field_types) - len(inconsistent_fields)}",
+        f"- 总字段数: {len(field_rows)}",
+        f"- 格式一致的字段数: {len(field_rows) - len(inconsistent_fields)}",
         f"- 格式不一致的字段数: {len(inconsistent_fields)}",
         "",
         "## 所有字段及其格式",
@@ -282,50 +954,8 @@ def generate_field_consistency_report(field_types, all_files):
         "| 层级 | 字段路径 | 数据类型 | 是否一致 | 出现的文件 |",
         "| ---- | -------- | -------- | -------- | ---------- |"
     ]
-    
-    # 按字段路径排序
-    sorted_fields = sorted(field_types.keys())
-    
-    # 添加字段信息
-    for field_path in sorted_fields:
-        types = field_types[field_path]
-        is_consistent = len(types) == 1
-        
-        # 计算字段层级
-        # 对于根级字段，层级为0；对于每个点号，层级加1
-        # 对于数组元素（如path[0]），不增加层级
-        level = field_path.count(".")
-        if "[" in field_path and "]" in field_path:
-            # 数组元素的处理，不增加额外层级
-            pass
-        
-        # 获取类型信息
-        type_info = ", ".join(types.keys())
-        
-        # 获取文件信息
-        if is_consistent:
-            # 对于一致的字段，显示文件列表或"所有文件"
-            files = list(types.values())[0]
-            if len(files) == total_files:
-                file_info = f"所有{total_files}个文件"
-            else:
-                if len(files) > 2:
-                    file_info = ", ".join(files[:2]) + f" 等{len(files)}个文件"
-                else:
-                    file_info = ", ".join(files) + f" 等{len(files)}个文件"
-        else:
-            # 对于不一致的字段，分开显示每种类型对应的文件
-            file_info_parts = []
-            for type_name, files in types.items():
-                if len(files) > 2:
-                    file_example = ", ".join(files[:2]) + f" 等{len(files)}个文件"
-                else:
-                    file_example = ", ".join(files) + f" 等{len(files)}个文件"
-                file_info_parts.append(f"{type_name}: {file_example}")
-            file_info = "<br>".join(file_info_parts)
-        
-        report.append(f"| {level} | {field_path} | {type_info} | {'是' if is_consistent else '否'} | {file_info} |")
-    
+    report.extend(field_rows)
+
     # 添加不一致字段的详细信息
     if inconsistent_fields:
         report.extend([
@@ -334,9 +964,7 @@ def generate_field_consistency_report(field_types, all_files):
             ""
         ])
         
-        for field_path in inconsistent_fields:
-            types = field_types[field_path]
-            
+        for field_path, types in inconsistent_fields:
             # 计算字段层级
             level = field_path.count(".")
             
@@ -347,11 +975,10 @@ def generate_field_consistency_report(field_types, all_files):
                 "| -------- | ---------- |"
             ])
             
-            for type_name, files in types.items():
-                # 显示该类型下的所有文件
-                file_list = ", ".join(files)
-                report.append(f"| {type_name} | {file_list} |")
-            
+            # 显示每种类型下的所有文件
+            report.extend([f"| {type_name} | {', '.join(files)} |"
+                           for type_name, files in types.items()])
+
             report.append("")
     
     return "\n".join(report)
@@ -385,18 +1012,35 @@ def analyze_consistency(all_results):
     all_types = set()
     for types in type_stats.values():
         all_types.update(types.keys())
-    
-    type_consistency = {type_name: True for type_name in all_types}
-    type_counts = {type_name: {} for type_name in all_types}
-    
-    for file, types in type_stats.items():
-        for type_name in all_types:
-            count = types.get(type_name, 0)
-            type_counts[type_name][file] = count
-    
-    for type_name, counts in type_counts.items():
-        if len(set(counts.values())) > 1:
-            type_consistency[type_name] = False
+
+    types_list = sorted(all_types)
+    files_list = list(type_stats)
+
+    if np is not None and types_list:
+        # 数据透视：一次稀疏填充(文件×类型)计数矩阵，
+        # 一致性判断向量化为各行与首行的逐列比较
+        type_index = {type_name: j for j, type_name in enumerate(types_list)}
+        counts_matrix = np.zeros((len(files_list), len(types_list)), dtype=np.int64)
+        for i, types in enumerate(type_stats.values()):
+            for type_name, count in types.items():
+                counts_matrix[i, type_index[type_name]] = count
+
+        consistent_cols = (counts_matrix == counts_matrix[0]).all(axis=0)
+        type_consistency = dict(zip(types_list, consistent_cols.tolist()))
+        type_counts = {type_name: dict(zip(files_list, counts_matrix[:, j].tolist()))
+                       for j, type_name in enumerate(types_list)}
+    else:
+        type_consistency = {type_name: True for type_name in types_list}
+        type_counts = {type_name: {} for type_name in types_list}
+
+        for file, types in type_stats.items():
+            for type_name in types_list:
+                count = types.get(type_name, 0)
+                type_counts[type_name][file] = count
+
+        for type_name, counts in type_counts.items():
+            if len(set(counts.values())) > 1:
+                type_consistency[type_name] = False
     
     # 生成一致性报告
     report = [
@@ -413,12 +1057,13 @@ def analyze_consistency(all_results):
     if is_level_consistent:
         report.append(f"所有文件的最大层级深度: {consistent_level}")
     else:
-        report.append("各文件的最大层级深度:")
-        report.append("")
-        report.append("| 文件 | 最大层级 |")
-        report.append("| ---- | -------- |")
-        for file, level in max_levels.items():
-            report.append(f"| {file} | {level} |")
+        report.extend((
+            "各文件的最大层级深度:",
+            "",
+            "| 文件 | 最大层级 |",
+            "| ---- | -------- |"
+        ))
+        report.extend([f"| {file} | {level} |" for file, level in max_levels.items()])
     
     report.extend([
         "",
@@ -430,7 +1075,7 @@ def analyze_consistency(all_results):
     report.append("| 数据类型 | 是否一致 | 详情 |")
     report.append("| -------- | -------- | ---- |")
     
-    for type_name in sorted(all_types):
+    for type_name in types_list:
         is_consistent = type_consistency[type_name]
         if is_consistent:
             count = list(type_counts[type_name].values())[0]
@@ -466,6 +1111,8 @@ if __name__ == "__main__":
     group.add_argument('--file', help='要分析的单个JSON文件路径')
     group.add_argument('--folder', help='包含多个JSON文件的文件夹路径')
     parser.add_argument('--output', default='./analysis_results', help='分析报告输出目录，默认为"./analysis_results"')
+    parser.add_argument('--stream', action='store_true', help='使用ijson流式解析，内存占用恒定，适合超大JSON文件（需安装ijson）')
+    parser.add_argument('--no-report', action='store_true', help='文件夹分析时只输出一致性结论，跳过完整的逐字段报告，适合CI等只关心校验结果的场景')
     
     # 解析命令行参数
     args = parser.parse_args()
@@ -473,10 +1120,11 @@ if __name__ == "__main__":
     # 根据参数执行相应的分析
     if args.file:
         print(f"开始分析单个JSON文件: {args.file}")
-        analys_json(args.file, args.output)
+        analys_json(args.file, args.output, stream=args.stream)
     elif args.folder:
         print(f"开始分析文件夹中的所有JSON文件: {args.folder}")
-        analys_json_folder(args.folder, args.output)
+        analys_json_folder(args.folder, args.output, stream=args.stream,
+                           report_level="summary" if args.no_report else "full")
     
     print("分析完成！")
     